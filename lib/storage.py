@@ -1,25 +1,134 @@
-def load_tasks(path: str) -> list[dict]:
-    """Carga la lista de tareas desde un archivo JSON.
+import dataclasses
+import json
+import mmap
+import os
+
+try:
+    import orjson
+    JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    orjson = None
+    JSONDecodeError = json.JSONDecodeError
+
+try:
+    import msgspec
+
+    class Task(msgspec.Struct):
+        """Una tarea tipada; msgspec valida y convierte los tipos en C
+        al decodificar, sin pasar por dicts intermedios."""
+        id: int
+        date: str = ""
+        title: str = ""
+        description: str = ""
+        done: bool = False
+        updated_at: str = ""
+
+    _decode_tasks = msgspec.json.Decoder(list[Task]).decode
+    _encode_tasks = msgspec.json.Encoder().encode
+    _DecodeError = (JSONDecodeError, msgspec.DecodeError)
+except ImportError:
+    msgspec = None
+
+    @dataclasses.dataclass
+    class Task:
+        """Una tarea tipada (fallback sin msgspec, misma interfaz)."""
+        id: int
+        date: str = ""
+        title: str = ""
+        description: str = ""
+        done: bool = False
+        updated_at: str = ""
+
+    _DecodeError = JSONDecodeError
+
+# Alias a nivel de módulo: ahorra el lookup de atributo en la ruta caliente.
+_json_loads = json.loads
+_json_dump = json.dump
+
+# Por debajo de este tamaño el mmap no compensa su costo de montaje.
+_MMAP_MIN_SIZE = 64 * 1024
+
+
+def _to_task(d: dict) -> Task:
+    """Convierte (coaccionando tipos) un dict crudo a Task.
+
+    Una fila sin "id" lanza KeyError para que quien llama la descarte,
+    igual que hacía el int(t["id"]) original."""
+    return Task(
+        id=int(d["id"]),
+        date=str(d.get("date", "")),
+        title=str(d.get("title", "")),
+        description=str(d.get("description", "")),
+        done=bool(d.get("done", False)),
+        updated_at=str(d.get("updated_at", "")),
+    )
+
+
+def _parse_tasks(buf) -> list[Task] | None:
+    """Decodifica un buffer JSON a list[Task]; devuelve None si el
+    contenido no es una lista.
+
+    Con msgspec intenta primero la decodificación tipada en una sola
+    pasada en C; si los tipos no cuadran (p. ej. ids legados como string)
+    re-decodifica laxo y coacciona fila por fila, igual que el fallback,
+    en vez de descartar el archivo entero.
+    """
+    if msgspec is not None:
+        try:
+            return _decode_tasks(buf)
+        except msgspec.ValidationError:
+            data = msgspec.json.decode(buf)
+    elif orjson is not None:
+        data = orjson.loads(buf)
+    else:
+        data = _json_loads(buf)
+    if not isinstance(data, list):
+        return None
+    out = []
+    for d in data:
+        try:
+            out.append(_to_task(d))
+        except Exception:
+            continue
+    return out
+
+
+def load_tasks(path: str) -> list[Task]:
+    """Carga la lista de tareas (como Task tipados) desde un archivo JSON.
 
     Si el archivo no existe → devuelve [].
     Si está corrupto → imprime aviso y devuelve [] (no crashea).
     Si el contenido no es una lista → devuelve [].
-    """
-    import json
-    import os
-
-    if not os.path.exists(path):
-        return []
 
+    Con msgspec instalado el JSON se decodifica directo a structs tipados
+    en una sola pasada en C; si no, se parsea con orjson/json y se
+    convierte fila por fila.
+    """
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return data
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size >= _MMAP_MIN_SIZE:
+                # Archivos grandes: se parsea directo desde el page cache,
+                # sin copiar todo el archivo a un bytes intermedio.
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if msgspec is not None or orjson is not None:
+                        # El context manager libera la vista aunque el parse
+                        # falle; si quedara viva, mmap.close() lanzaría
+                        # BufferError y taparía el aviso de archivo corrupto.
+                        with memoryview(mm) as buf:
+                            loaded = _parse_tasks(buf)
+                    else:
+                        loaded = _parse_tasks(mm[:])  # json estándar no acepta memoryview
             else:
-                print(f"El contenido de {path} no es una lista. Devolviendo lista vacía.")
-                return []
-    except json.JSONDecodeError:
+                loaded = _parse_tasks(f.read())
+        if loaded is None:
+            print(f"El contenido de {path} no es una lista. Devolviendo lista vacía.")
+            return []
+        return loaded
+    except FileNotFoundError:
+        # EAFP: un solo open en vez de stat + open en el camino feliz.
+        return []
+    except _DecodeError:
         print(f"El archivo {path} está corrupto o no es un JSON válido. Devolviendo lista vacía.")
         return []
     except Exception as e:
@@ -28,16 +137,53 @@ def load_tasks(path: str) -> list[dict]:
 
 
 
-def save_tasks(path: str, tasks: list[dict]) -> None:
+def save_tasks(path: str, tasks: list[Task], pretty: bool = False) -> None:
     """Guarda la lista de tareas en un archivo JSON.
 
+    Por defecto escribe compacto (tasks.json es un archivo de máquina:
+    menos bytes = menos I/O y parseo más rápido); con pretty=True indenta
+    para exports que va a leer una persona.
+
+    Escribe primero a un .tmp y luego os.replace(), así un corte a mitad
+    de escritura nunca deja tasks.json truncado. Con TAREAS_NO_FSYNC=1
+    se salta el fsync (más rápido, menos durable).
+
     Si hay un error al escribir, imprime un aviso (no crashea).
     """
-    import json
+    tmp = path + ".tmp"
     try:
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(tasks, f, ensure_ascii=False, indent=2)
+        # Buffer de 1 MiB: agrupa la salida en pocas syscalls de escritura.
+        if msgspec is not None:
+            body = _encode_tasks(tasks)
+            if pretty:
+                body = msgspec.json.format(body, indent=2)
+            with open(tmp, 'wb', buffering=1 << 20) as f:
+                f.write(body)
+                if os.environ.get("TAREAS_NO_FSYNC") != "1":
+                    f.flush()
+                    os.fsync(f.fileno())
+        elif orjson is not None:
+            # orjson serializa dataclasses de forma nativa.
+            option = orjson.OPT_NON_STR_KEYS
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            with open(tmp, 'wb', buffering=1 << 20) as f:
+                f.write(orjson.dumps(tasks, option=option))
+                if os.environ.get("TAREAS_NO_FSYNC") != "1":
+                    f.flush()
+                    os.fsync(f.fileno())
+        else:
+            rows = [dataclasses.asdict(t) if dataclasses.is_dataclass(t) else t
+                    for t in tasks]
+            with open(tmp, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                if pretty:
+                    _json_dump(rows, f, ensure_ascii=False, indent=2)
+                else:
+                    _json_dump(rows, f, ensure_ascii=True, separators=(',', ':'))
+                if os.environ.get("TAREAS_NO_FSYNC") != "1":
+                    f.flush()
+                    os.fsync(f.fileno())
+        os.replace(tmp, path)
     except Exception as e:
         print(f"Ocurrió un error al escribir en {path}: {e}.")
         # No crashea, solo avisa
-
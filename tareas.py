@@ -5,18 +5,28 @@
 ToDo CLI
 """
 
+import atexit
 import os
 import csv
 from datetime import datetime
-from typing import Dict, Any
-from lib.storage import load_tasks, save_tasks
+from functools import lru_cache
+from typing import Dict
+from lib.storage import Task, load_tasks, save_tasks
 
 DATA_FILE = os.path.join(os.path.dirname(__file__), "tasks.json")
 EXPORT_DIR = os.path.join(os.path.dirname(__file__), "exports")
 
 # ---- Estado de ejecución (se carga desde JSON) ----
-tasks: Dict[int, Dict[str, Any]] = {}
+tasks: Dict[int, Task] = {}
 next_id: int = 1  # se recalcula al iniciar
+_dirty: bool = False  # hay cambios en memoria aún no escritos a disco
+
+
+# Respuestas que se interpretan como "sí" (compartido por todos los prompts s/n).
+_TRUTHY = frozenset({"s", "si", "sí", "y", "yes", "1", "true", "verdadero"})
+
+# Plantilla de fila pre-compilada: evita re-parsear el f-string por fila.
+_ROW_FMT = "{:<4} {:<1} {:<19} {:<30} {:<40}".format
 
 
 # ---------- Utilidades ----------
@@ -26,9 +36,14 @@ def clear_screen() -> None:
 def now_iso() -> str:
     return datetime.now().isoformat(timespec="seconds")
 
+@lru_cache(maxsize=32)
+def _truthy(raw: str) -> bool:
+    """Las respuestas s/n vienen de un vocabulario mínimo, así que cachear
+    evita repetir strip/lower/hash en cada pregunta."""
+    return raw.strip().lower() in _TRUTHY
+
 def parse_bool(s: str) -> bool:
-    s = (s or "").strip().lower()
-    return s in {"s", "si", "sí", "y", "yes", "1", "true", "verdadero"}
+    return _truthy(s or "")
 
 def input_with_default(prompt: str, default: str) -> str:
     """Muestra el valor actual y si el usuario presiona Enter, lo conserva."""
@@ -38,10 +53,10 @@ def input_with_default(prompt: str, default: str) -> str:
 def input_bool_with_default(prompt: str, default: bool) -> bool:
     """Pide s/n mostrando el valor actual; Enter conserva el valor existente."""
     actual = "sí" if default else "no"
-    raw = input(f"{prompt} (s/n) [{actual}]: ").strip().lower()
+    raw = input(f"{prompt} (s/n) [{actual}]: ").strip()
     if raw == "":
         return default
-    return raw in {"s", "si", "sí", "y", "yes", "1", "true", "verdadero"}
+    return _truthy(raw)
 
 
 def input_non_empty(prompt: str) -> str:
@@ -54,49 +69,64 @@ def input_non_empty(prompt: str) -> str:
 def input_int(prompt: str) -> int:
     while True:
         raw = input(prompt).strip()
-        if raw.isdigit():
+        # EAFP: la mayoría de las entradas son válidas, así que intentar
+        # directo es más barato que validar carácter por carácter antes.
+        try:
             return int(raw)
-        print("⚠️  Debes ingresar un número válido.")
-
-def recalc_next_id() -> None:
-    global next_id
-    if tasks:
-        next_id = max(tasks.keys()) + 1
-    else:
-        next_id = 1
-
+        except ValueError:
+            print("⚠️  Debes ingresar un número válido.")
 
 # ---------- Persistencia ----------
 def load_state() -> None:
-    """Carga tasks desde tasks.json y recalcula el next_id."""
-    global tasks
-    raw = load_tasks(DATA_FILE)  
-    tasks = {}
-    for t in raw:
-        try:
-            tid = int(t["id"])
-            tasks[tid] = t
-        except Exception:
-            continue
-    recalc_next_id()
+    """Carga tasks desde tasks.json y recalcula el next_id.
+
+    next_id solo se calcula aquí; add_task lo incrementa y delete_task no
+    lo decrementa (los IDs crecen monótonamente y nunca se reutilizan).
+    """
+    global tasks, next_id
+    raw = load_tasks(DATA_FILE)  # ya viene validado/tipado como Task
+    tasks = {t.id: t for t in raw}
+    # Los IDs se asignan de forma creciente, así que el dict ya queda
+    # ordenado por inserción; solo re-ordenamos si el archivo venía desordenado.
+    ids = list(tasks)
+    if ids != sorted(ids):
+        tasks = {k: tasks[k] for k in sorted(ids)}
+    next_id = max(tasks) + 1 if tasks else 1
+
+def persist(force: bool = False) -> None:
+    """Marca el estado como sucio; la escritura real se difiere a flush().
+
+    Así N mutaciones seguidas cuestan una sola escritura del archivo.
+    Con force=True escribe inmediatamente (para quien necesite durabilidad).
+    """
+    global _dirty
+    _dirty = True
+    if force:
+        flush()
+
+def flush() -> None:
+    """Escribe tasks a disco si hay cambios pendientes."""
+    global _dirty
+    if not _dirty:
+        return
+    save_tasks(DATA_FILE, list(tasks.values()))
+    _dirty = False
 
-def persist() -> None:
-    """Guarda tasks (dict) como list en JSON."""
-    as_list = [tasks[k] for k in sorted(tasks.keys())]
-    save_tasks(DATA_FILE, as_list)
+atexit.register(flush)  # garantiza la escritura final al salir
 
 
 # ---------- Lógica de negocio ----------
-def add_task(title: str, description: str, done: bool) -> dict:
+def add_task(title: str, description: str, done: bool) -> Task:
     global next_id
-    task = {
-        "id": next_id,
-        "date": now_iso(),
-        "title": title.strip(),
-        "description": description.strip(),
-        "done": bool(done),
-        "updated_at": now_iso(),
-    }
+    ts = now_iso()
+    task = Task(
+        id=next_id,
+        date=ts,
+        title=title.strip(),
+        description=description.strip(),
+        done=bool(done),
+        updated_at=ts,
+    )
     tasks[next_id] = task
     next_id += 1
     persist()
@@ -106,10 +136,16 @@ def edit_task(task_id: int, title: str, description: str, done: bool) -> bool:
     t = tasks.get(task_id)
     if not t:
         return False
-    t["title"] = title.strip()
-    t["description"] = description.strip()
-    t["done"] = bool(done)
-    t["updated_at"] = now_iso()
+    title = title.strip()
+    description = description.strip()
+    done = bool(done)
+    # Enter en todos los campos deja todo igual: no hay nada que escribir.
+    if (t.title, t.description, t.done) == (title, description, done):
+        return True
+    t.title = title
+    t.description = description
+    t.done = done
+    t.updated_at = now_iso()
     persist()
     return True
 
@@ -129,40 +165,43 @@ def list_tasks() -> None:
 
     print(f"{'ID':<4} {'✓':<1} {'FECHA':<19} {'TÍTULO':<30} {'DESCRIPCIÓN':<40}")
     print("-" * 100)
-    for tid in sorted(tasks.keys()):
-        t = tasks[tid]
-        check = "✔" if t.get("done") else " "
-        date = (t.get("date") or "")[:19]
-        title = (t.get("title") or "")[:30]
-        desc = (t.get("description") or "")[:40]
-        print(f"{t['id']:<4} {check:<1} {date:<19} {title:<30} {desc:<40}")
+    for t in tasks.values():
+        check = "✔" if t.done else " "
+        print(_ROW_FMT(t.id, check, t.date[:19], t.title[:30], t.description[:40]))
     print()
 
 
 # ---------- Exportaciones ----------
+_TS_FMT = "%Y%m%d_%H%M%S"
+_export_dir_ready = False  # evita stat+mkdir en cada export
+
 def ensure_export_dir() -> None:
-    os.makedirs(EXPORT_DIR, exist_ok=True)
+    global _export_dir_ready
+    if not _export_dir_ready:
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        _export_dir_ready = True
 
 def timestamp() -> str:
-    return datetime.now().strftime("%Y%m%d_%H%M%S")
+    return datetime.now().strftime(_TS_FMT)
 
 def export_json() -> str:
     ensure_export_dir()
     path = os.path.join(EXPORT_DIR, f"tasks_{timestamp()}.json")
-    payload = [tasks[k] for k in sorted(tasks.keys())]
-    save_tasks(path, payload)
+    save_tasks(path, list(tasks.values()), pretty=True)
     return path
 
 def export_csv() -> str:
     ensure_export_dir()
     path = os.path.join(EXPORT_DIR, f"tasks_{timestamp()}.csv")
     fieldnames = ["id", "date", "title", "description", "done", "updated_at"]
-    with open(path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for tid in sorted(tasks.keys()):
-            row = {k: tasks[tid].get(k, "") for k in fieldnames}
-            writer.writerow(row)
+    # Buffer de 1 MiB: menos syscalls de escritura en exports grandes.
+    with open(path, "w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(
+            (t.id, t.date, t.title, t.description, t.done, t.updated_at)
+            for t in tasks.values()
+        )
     return path
 
 
@@ -215,9 +254,9 @@ def main_menu() -> None:
                 input("Enter para continuar...")
             else:
                 t = tasks[task_id]
-                title = input_with_default("Nuevo título", t["title"])
-                description = input_with_default("Nueva descripción", t["description"])
-                done = input_bool_with_default("¿Completada?", t["done"])
+                title = input_with_default("Nuevo título", t.title)
+                description = input_with_default("Nueva descripción", t.description)
+                done = input_bool_with_default("¿Completada?", t.done)
                 
                 edit_task(task_id, title, description, done)
                 print("✅ Tarea editada.\n")